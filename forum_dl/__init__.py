@@ -42,6 +42,7 @@ def main():
                 warc_output=warc_output,
                 user_agent=args.user_agent,
                 get_urls=args.get_urls,
+                concurrent_requests=args.concurrent_requests,
             ),
             extractor_options=ExtractorOptions(
                 path=False,
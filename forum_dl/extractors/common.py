@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
 from pathlib import PurePosixPath
 from datetime import datetime
+from functools import lru_cache
 import logging
 import traceback
 
@@ -32,11 +33,20 @@ def get_relative_url(url: str, base_url: str):
     return str(path.relative_to(base_path))
 
 
+def get_declared_encoding(response: Response):
+    # Without a declared charset, requests assumes ISO-8859-1 for HTML, so leave those
+    # to bs4's detection, which also reads <meta charset>.
+    if "charset" in response.headers.get("content-type", "").lower():
+        return response.encoding
+
+
+# Extractors normalize the same few base and redirect URLs over and over.
+@lru_cache(maxsize=8192)
 def normalize_url(
     url: str,
-    remove_suffixes: list[str] = ["index.php"],
+    remove_suffixes: tuple[str, ...] = ("index.php",),
     append_slash: bool = True,
-    keep_queries: list[str] = [],
+    keep_queries: tuple[str, ...] = (),
 ):
     parsed_url = urlparse(url)
     new_path = parsed_url.path.removesuffix("/")
@@ -153,6 +163,7 @@ class Extractor(ABC):
             path=(), url=self._resolve_url(base_url), origin=base_url, data={}, title=""
         )
         self._boards: list[Board] = [self.root]
+        self._boards_by_url: dict[str, Board] = {self.root.url: self.root}
         self._subboards: dict[tuple[str, ...], dict[str, Board]] = {(): {}}
         self._are_subboards_fetched: dict[tuple[str, ...], bool] = {(): False}
         self._are_all_boards_fetched: bool = False
@@ -184,8 +195,15 @@ class Extractor(ABC):
         parent_board = self._find_board(replace_path[:-1])
 
         if replace_path[-1] in self._subboards[parent_board.path]:
+            board = self._subboards[parent_board.path][replace_path[-1]]
+            old_url = board.url
+
             for k, v in kwargs.items():
-                setattr(self._subboards[parent_board.path][replace_path[-1]], k, v)
+                setattr(board, k, v)
+
+            if board.url != old_url:
+                self._index_board_url(old_url)
+                self._index_board_url(board.url)
 
             new_parent_board = self._find_board(path[:-1])
             self._subboards[new_parent_board.path][path[-1]] = self._subboards[
@@ -205,7 +223,10 @@ class Extractor(ABC):
                 path=replace_path, **kwargs
             )
             self._subboards[replace_path] = {}
-            self._boards.append(self._subboards[parent_board.path][replace_path[-1]])
+            board = self._subboards[parent_board.path][replace_path[-1]]
+            self._boards.append(board)
+            # Like a scan of self._boards, the first board with a given URL wins.
+            self._boards_by_url.setdefault(board.url, board)
 
             if are_subboards_fetched is not None:
                 self._are_subboards_fetched[replace_path] = are_subboards_fetched
@@ -214,6 +235,15 @@ class Extractor(ABC):
 
             return self._subboards[parent_board.path][replace_path[-1]]
 
+    def _index_board_url(self, url: str):
+        # Like a scan of self._boards, the first board with a given URL wins.
+        for board in self._boards:
+            if board.url == url:
+                self._boards_by_url[url] = board
+                return
+
+        self._boards_by_url.pop(url, None)
+
     @final
     def _fetch_lower_boards(self, board: Board):
         if self._are_all_boards_fetched:
@@ -410,16 +440,37 @@ class HtmlExtractor(Extractor):
     @final
     def _fetch_board_page_threads(self, board: Board, state: PageState):
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = Soup(response.content, from_encoding=get_declared_encoding(response))
+
+        # Fetch the next page while this one's threads are being processed.
+        next_state = self._extract_board_next_page_state(board, state, response, soup)
+        if next_state:
+            self._session.prefetch((next_state.url,))
+
+        threads = [
+            thread
+            for tag in soup.soup.select(self._board_item_css)
+            if (
+                thread := self._extract_board_page_thread(
+                    board, state, response, SoupTag(tag)
+                )
+            )
+        ]
+
+        for i, thread in enumerate(threads):
+            # The posts of every thread are usually fetched right after it's yielded,
+            # so keep the first pages of the next few threads in flight.
+            self._session.prefetch(
+                upcoming_thread.url
+                for upcoming_thread in threads[
+                    i : i + self._session.concurrent_requests
+                ]
+            )
 
-        for tag in soup.soup.select(self._board_item_css):
-            if thread := self._extract_board_page_thread(
-                board, state, response, SoupTag(tag)
-            ):
-                yield thread
+            yield thread
 
         yield from self._extract_file_objects((), (), soup, response)
-        return self._extract_board_next_page_state(board, state, response, soup)
+        return next_state
 
     @abstractmethod
     def _extract_board_page_thread(
@@ -438,7 +489,11 @@ class HtmlExtractor(Extractor):
     @final
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = Soup(response.content, from_encoding=get_declared_encoding(response))
+
+        next_state = self._extract_thread_next_page_state(thread, state, response, soup)
+        if next_state:
+            self._session.prefetch((next_state.url,))
 
         content_file_urls: list[str] = []
 
@@ -458,7 +513,7 @@ class HtmlExtractor(Extractor):
             if file.url not in content_file_urls:
                 yield file
 
-        return self._extract_thread_next_page_state(thread, state, response, soup)
+        return next_state
 
     @abstractmethod
     def _extract_thread_page_post(
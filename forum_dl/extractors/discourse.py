@@ -74,37 +74,42 @@ class DiscourseExtractor(Extractor):
     def _fetch_top_boards(self):
         self._are_subboards_fetched[self.root.path] = True
         response = self._session.get(urljoin(self.base_url, "site.json"))
-        site_json = response.json()
+        site_json = self._session.decode_json(response)
 
-        for category_data in site_json["categories"]:
-            if "parent_category_id" not in category_data:
-                category_id = str(category_data["id"])
-
-                self._set_board(
-                    path=(category_id,),
-                    url=urljoin(
-                        self.base_url, f"c/{category_data['slug']}/{category_id}"
-                    ),
-                    origin=response.url,
-                    data=category_data,
-                    title=category_data["name"],
-                    are_subboards_fetched=True,
-                )
+        top_categories: list[dict[str, Any]] = []
+        subcategories: list[dict[str, Any]] = []
 
         for category_data in site_json["categories"]:
             if "parent_category_id" in category_data:
-                slug = category_data["slug"]
-                category_id = str(category_data["id"])
-                parent_id = str(category_data["parent_category_id"])
-
-                self._set_board(
-                    path=(parent_id, category_id),
-                    url=urljoin(self.base_url, f"c/{slug}/{category_id}"),
-                    origin=response.url,
-                    data=category_data,
-                    title=category_data["name"],
-                    are_subboards_fetched=True,
-                )
+                subcategories.append(category_data)
+            else:
+                top_categories.append(category_data)
+
+        for category_data in top_categories:
+            category_id = str(category_data["id"])
+
+            self._set_board(
+                path=(category_id,),
+                url=urljoin(self.base_url, f"c/{category_data['slug']}/{category_id}"),
+                origin=response.url,
+                data=category_data,
+                title=category_data["name"],
+                are_subboards_fetched=True,
+            )
+
+        for category_data in subcategories:
+            slug = category_data["slug"]
+            category_id = str(category_data["id"])
+            parent_id = str(category_data["parent_category_id"])
+
+            self._set_board(
+                path=(parent_id, category_id),
+                url=urljoin(self.base_url, f"c/{slug}/{category_id}"),
+                origin=response.url,
+                data=category_data,
+                title=category_data["name"],
+                are_subboards_fetched=True,
+            )
 
     def _do_fetch_subboards(self, board: Board):
         pass
@@ -132,7 +137,7 @@ class DiscourseExtractor(Extractor):
             topic_id = url_parts[1]
             json_url = urljoin(self.base_url, f"t/{topic_id}.json")
             response = self._session.get(json_url, should_cache=True)
-            data = response.json()
+            data = self._session.decode_json(response)
 
             slug = data["slug"]
             category_id = str(data["category_id"])
@@ -174,7 +179,7 @@ class DiscourseExtractor(Extractor):
             state.url = f"{state.url}.json"
 
         response = self._session.get(state.url)
-        page_json = response.json()
+        page_json = self._session.decode_json(response)
 
         for data in page_json["topic_list"]["topics"]:
             topic_id = str(data["id"])
@@ -201,7 +206,7 @@ class DiscourseExtractor(Extractor):
         if state.url == thread.url:
             json_url = f"{state.url}.json"
             response = self._session.get(json_url)
-            page_json = response.json()
+            page_json = self._session.decode_json(response)
             state = DiscourseThreadPageState(
                 url=response.url,
                 stream_data=page_json["post_stream"]["stream"],
@@ -216,7 +221,7 @@ class DiscourseExtractor(Extractor):
                 params={"post_ids[]": post_ids},
                 should_cache=False,
             )
-            page_json = response.json()
+            page_json = self._session.decode_json(response)
 
         datas = page_json["post_stream"]["posts"]
 
@@ -3,14 +3,22 @@ from __future__ import annotations
 from typing import *  # type: ignore
 
 from abc import abstractmethod
-from urllib.parse import urljoin, urlparse, parse_qs
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
 import logging
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
 from ..session import Session
 
 
+@lru_cache(maxsize=65536)
+def datetime_from_timestamp(timestamp: int):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
 class HackernewsExtractor(Extractor):
     tests = [
         {
@@ -80,6 +88,13 @@ class HackernewsExtractor(Extractor):
     ]
 
     PAGE_SIZE = 1000
+    FIREBASE_ITEM_URL_PREFIX = "https://hacker-news.firebaseio.com/v0/item/"
+    FIREBASE_MAXITEM_URL = "https://hacker-news.firebaseio.com/v0/maxitem.json"
+    ALGOLIA_SEARCH_URL = "https://hn.algolia.com/api/v1/search_by_date"
+    ALGOLIA_TIME_SLACK = 60
+    ITEM_URL_PREFIX = "https://news.ycombinator.com/item?id="
+
+    _item_id_regex = re.compile(r"[?&]id=(\d+)")
 
     @staticmethod
     def _detect(session: Session, url: str, options: ExtractorOptions):
@@ -105,6 +120,14 @@ class HackernewsExtractor(Extractor):
 
             return HackernewsExtractor(session, urljoin(url, "/"), options)
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+
+        # Cached per instance, so that the caches don't outlive the extractor.
+        self._get_item_json = lru_cache(maxsize=100_000)(self._do_get_item_json)
+        self._fetch_item_thread = lru_cache(maxsize=100_000)(self._do_fetch_item_thread)
+        self._parent_ids: dict[int, int | None] = {}
+
     def _calc_first_item_id(self, page_id: int):
         return 1 + (page_id * self.PAGE_SIZE)
 
@@ -112,9 +135,11 @@ class HackernewsExtractor(Extractor):
         return (item_id - 1) // self.PAGE_SIZE
 
     def _fetch_top_boards(self):
-        firebase_url = f"https://hacker-news.firebaseio.com/v0/maxitem.json"
-        self._max_item_id = int(self._session.get(firebase_url).content)
-        self.pages: list[list[int]] = [[]] * (1 + self._calc_page_id(self._max_item_id))
+        self._max_item_id = int(self._session.get(self.FIREBASE_MAXITEM_URL).content)
+        # One bit per item id, allocated a page at a time.
+        self.pages: defaultdict[int, bytearray] = defaultdict(
+            lambda: bytearray((self.PAGE_SIZE + 7) // 8)
+        )
 
     def _do_fetch_subboards(self, board: Board):
         pass
@@ -128,10 +153,10 @@ class HackernewsExtractor(Extractor):
             return self.root
         # Thread.
         elif parsed_url.path == "/item":
-            parsed_query = parse_qs(parsed_url.query)
-            item_id = str(parsed_query["id"][0])
+            if not (match := self._item_id_regex.search(url)):
+                raise ValueError
 
-            return self._fetch_item_thread(int(item_id))
+            return self._fetch_item_thread(int(match.group(1)))
 
         raise ValueError
 
@@ -147,32 +172,51 @@ class HackernewsExtractor(Extractor):
 
         page_id = self._calc_page_id(item_id)
 
-        if item_id in self.pages[page_id]:
-            return False
+        # `get`, so that probing unvisited pages doesn't allocate them.
+        if (page := self.pages.get(page_id)) is None:
+            return True
 
-        return True
+        offset = item_id - self._calc_first_item_id(page_id)
+        return not page[offset >> 3] & (1 << (offset & 7))
 
     def _register_item(self, item_id: int):
         page_id = self._calc_page_id(item_id)
 
-        if page_id >= len(self.pages):
+        if page_id > self._calc_page_id(self._max_item_id):
             return False
 
-        self.pages[page_id].append(item_id)
+        offset = item_id - self._calc_first_item_id(page_id)
+        self.pages[page_id][offset >> 3] |= 1 << (offset & 7)
         return True
 
-    def _fetch_item_thread(self, item_id: int):
+    def _get_item_firebase_url(self, item_id: int | str):
+        return self.FIREBASE_ITEM_URL_PREFIX + str(item_id) + ".json"
+
+    def _get_item_url(self, item_id: int | str):
+        return self.ITEM_URL_PREFIX + str(item_id)
+
+    def _do_get_item_json(self, item_id: int, should_cache: bool = False) -> Any:
+        firebase_url = self._get_item_firebase_url(item_id)
+        return self._session.get_json(firebase_url, should_cache=should_cache)
+
+    def _do_fetch_item_thread(self, item_id: int):
+        # Climb through the parents we have already seen without making any requests.
+        while (parent_id := self._parent_ids.get(item_id)) is not None:
+            item_id = parent_id
+
         while True:
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json"
-            response = self._session.get(firebase_url, should_cache=True)
-            data = response.json()
+            firebase_url = self._get_item_firebase_url(item_id)
+            data = self._get_item_json(item_id, should_cache=True)
+
+            # Firebase returns null for ids that don't exist.
+            if not data:
+                raise ValueError(f"Item at item_id={item_id} is null")
 
             if "parent" in data:
+                self._parent_ids[item_id] = data["parent"]
                 item_id = data["parent"]
             else:
-                page_id = self._calc_page_id(item_id)
-                self.pages[page_id].append(item_id)
-
+                self._parent_ids[item_id] = None
                 self._register_item(item_id)
                 return Thread(
                     path=(
@@ -180,84 +224,183 @@ class HackernewsExtractor(Extractor):
                             item_id,
                         ),
                     ),
-                    url=f"https://news.ycombinator.com/item?id={item_id}",
-                    origin=response.url,
+                    url=self._get_item_url(item_id),
+                    origin=firebase_url,
                     data=data,
                     title=data.get("title", None),
                 )
 
+    def _get_item_time(self, item_id: int) -> int | None:
+        try:
+            data = self._get_item_json(item_id, should_cache=True)
+        except Exception:
+            return None
+
+        return data.get("time") if data else None
+
+    def _fetch_page_root_ids(self, page_id: int):
+        # Algolia knows the story each comment belongs to, so we can avoid walking up
+        # the parent chain on Firebase for every item of the page.
+        root_ids: dict[int, int] = {}
+
+        first_item_id = self._calc_first_item_id(page_id)
+        last_item_id = min(self._calc_first_item_id(page_id + 1) - 1, self._max_item_id)
+
+        # Algolia can't filter on ids, only on creation times, so bound the search by
+        # the times of the page's first and last items. Both are requested by the
+        # Firebase walk later anyway.
+        first_time = self._get_item_time(first_item_id)
+        last_time = self._get_item_time(last_item_id)
+
+        if first_time is None or last_time is None:
+            logging.debug(
+                f"Page {page_id} has no time bounds, walking Firebase instead"
+            )
+            return root_ids
+
+        # Ids are only roughly in time order, so leave some slack around the bounds.
+        numeric_filters = (
+            f"created_at_i>={first_time - self.ALGOLIA_TIME_SLACK},"
+            f"created_at_i<={last_time + self.ALGOLIA_TIME_SLACK}"
+        )
+
+        try:
+            algolia_page = 0
+            algolia_page_count = 1
+
+            while algolia_page < algolia_page_count:
+                json = self._session.get_json(
+                    self.ALGOLIA_SEARCH_URL,
+                    params={
+                        # Comments too, as their story_id is what saves the walk.
+                        "tags": "(story,comment)",
+                        "numericFilters": numeric_filters,
+                        "hitsPerPage": self.PAGE_SIZE,
+                        "page": algolia_page,
+                    },
+                    should_retry=False,
+                )
+
+                for hit in json["hits"]:
+                    item_id = int(hit["objectID"])
+
+                    if first_item_id <= item_id <= last_item_id:
+                        root_ids[item_id] = int(hit.get("story_id") or item_id)
+
+                algolia_page += 1
+                algolia_page_count = json["nbPages"]
+        except Exception as e:
+            # Items that Algolia didn't return are resolved by walking Firebase.
+            logging.debug(f"Algolia search failed, walking Firebase instead: {e!r}")
+
+        return root_ids
+
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        # FIXME: This is ineffective, as we connect twice for each non-top item.
         # We make artificial pages of 1000 items.
 
-        parsed_state_url = urlparse(state.url)
-        parsed_query = parse_qs(parsed_state_url.query)
-
-        if "id" in parsed_query:
-            state_item_id = int(parsed_query["id"][0])
+        if match := self._item_id_regex.search(state.url):
+            state_item_id = int(match.group(1))
             page_id = self._calc_page_id(state_item_id)
         else:
             page_id = self._calc_page_id(self._max_item_id)
 
         # Remove pages above the state item id.
-        del self.pages[page_id + 1 :]
+        for above_page_id in [k for k in self.pages if k > page_id]:
+            del self.pages[above_page_id]
 
-        for item_id in reversed(
-            range(
-                self._calc_first_item_id(page_id), self._calc_first_item_id(page_id + 1)
-            )
-        ):
+        root_ids = self._fetch_page_root_ids(page_id)
+        item_ids = range(
+            self._calc_first_item_id(page_id + 1) - 1,
+            self._calc_first_item_id(page_id) - 1,
+            -1,
+        )
+
+        for i, item_id in enumerate(item_ids):
             if not self._get_is_fetchable(item_id):
                 continue
 
-            yield self._fetch_item_thread(item_id)
+            # Keep the first requests of the next few items in flight. Items whose
+            # parent we already know are skipped, as they won't be requested.
+            self._session.prefetch(
+                self._get_item_firebase_url(root_ids.get(next_item_id, next_item_id))
+                for next_item_id in item_ids[i : i + self._session.concurrent_requests]
+                if self._get_is_fetchable(next_item_id)
+                and (next_item_id in root_ids or next_item_id not in self._parent_ids)
+            )
+
+            # Items missing from Algolia (e.g. dead or not yet indexed) are resolved
+            # by walking up their parents on Firebase.
+            yield self._fetch_item_thread(root_ids.get(item_id, item_id))
 
         if page_id > 0:
             new_state_item_id = self._calc_first_item_id(page_id) - 1
             return PageState(
-                url=f"https://news.ycombinator.com/item?id={new_state_item_id}",
+                url=self._get_item_url(new_state_item_id),
                 page=state.page + 1,
             )
 
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
-        post_paths: list[tuple[str, ...]] = [()]
+        # Breadth-first, one level of the comment tree at a time. The kids of every item
+        # are prefetched as soon as it's fetched, so a whole level is in flight while the
+        # previous one is being yielded.
+        level_post_paths: list[tuple[str, ...]] = [()]
+        # Guards against kids listed twice, or listing an ancestor, which would
+        # otherwise fetch items again or loop forever.
+        seen_ids: set[int] = {int(thread.path[-1])}
 
-        i = 0
-        while True:
-            post_path = post_paths[i]
+        while level_post_paths:
+            next_level_post_paths: list[tuple[str, ...]] = []
 
-            if post_path:
-                post_id = post_path[-1]
-            else:
-                post_id = thread.path[-1]
+            for post_path in level_post_paths:
+                if post_path:
+                    post_id = post_path[-1]
+                else:
+                    post_id = thread.path[-1]
+
+                firebase_url = self._get_item_firebase_url(post_id)
+                data = self._get_item_json(int(post_id))
 
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{post_id}.json"
+                if not data:
+                    logging.warning(f"Item at post_id={post_id} is null")
+                    continue
 
-            response = self._session.get(firebase_url)
-            data = response.json()
+                kid_ids: list[int] = []
+
+                for kid_id in data.get("kids", []):
+                    if kid_id in seen_ids:
+                        continue
+
+                    seen_ids.add(kid_id)
+                    kid_ids.append(kid_id)
+                    next_level_post_paths.append(post_path + (str(kid_id),))
+                    self._parent_ids[kid_id] = int(post_id)
+
+                # Before yielding, so that the requests overlap with whatever the
+                # consumer does with this post.
+                self._session.prefetch(
+                    self._get_item_firebase_url(kid_id) for kid_id in kid_ids
+                )
 
-            if data:
                 self._register_item(int(post_id))
-                yield Post(
+
+                # All fields already have their final types, so skip pydantic's
+                # validation, which dominates the cost of building a post.
+                yield Post.construct(
                     path=thread.path,
                     subpath=post_path,
                     url=thread.url,
-                    origin=response.url,
+                    origin=firebase_url,
                     data=data,
                     author=data.get("by", ""),
-                    creation_time=datetime.utcfromtimestamp(data.get("time")),
+                    creation_time=(
+                        datetime_from_timestamp(data["time"])
+                        if "time" in data
+                        else None
+                    ),
                     content=data.get("text", ""),
                 )
 
-                for kid_id in data.get("kids", []):
-                    post_paths.append(post_path + (str(kid_id),))
-
-            else:
-                logging.warning(f"Item at post_id={post_path[-1]} is null")
-
-            i += 1
-            if i == len(post_paths):
-                break
+            level_post_paths = next_level_post_paths
 
 
 class HackernewsSpecificExtractor(HackernewsExtractor):
@@ -272,16 +415,23 @@ class HackernewsSpecificExtractor(HackernewsExtractor):
         return self.root
 
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        json = self._session.get(self.get_firebase_url()).json()
-
-        for story_id in json:
-            firebase_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            response = self._session.get(firebase_url)
-            data = response.json()
+        # The story lists change slowly, so one fetch per run is enough.
+        json = self._session.get_json(self.get_firebase_url(), should_cache=True)
+        # Cached, so that fetching the posts of the story doesn't request it again.
+        responses = self._session.get_many(
+            (self._get_item_firebase_url(story_id) for story_id in json),
+            should_cache=True,
+        )
+
+        for story_id, response in zip(json, responses):
+            # Decoded through the session, so fetching the posts reuses it.
+            data = self._session.get_json(
+                self._get_item_firebase_url(story_id), should_cache=True
+            )
 
             yield Thread(
                 path=(str(story_id),),
-                url=f"https://news.ycombinator.com/item?id={story_id}",
+                url=self._get_item_url(story_id),
                 origin=response.url,
                 data=data,
                 title=data.get("title", ""),
@@ -2,10 +2,12 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 
-from pathlib import PurePosixPath
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
+from datetime import datetime
 import dateparser
 import re
+import soupsieve
 
 from .common import normalize_url
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
@@ -68,7 +70,12 @@ class HyperkittyExtractor(Extractor):
         },
     ]
 
-    _reply_level_regex = re.compile(r"reply-level-(\d+)")
+    _footer_anchor_strings = {"Postorius Documentation", "HyperKitty"}
+    _latest_page_regex = re.compile(r"latest\?page=(\d+)$")
+    _list_name_selector = soupsieve.compile("a.list-name")
+    _page_link_anchor_selector = soupsieve.compile("a.page-link")
+    _page_link_selector = soupsieve.compile(".page-link")
+    _reply_selector = soupsieve.compile("div.even, div.odd")
 
     @staticmethod
     def _detect(session: Session, url: str, options: ExtractorOptions):
@@ -77,28 +84,42 @@ class HyperkittyExtractor(Extractor):
             should_cache=True,
             should_retry=False,
         )
-        soup = Soup(response.content)
 
-        if extractor := HyperkittyExtractor.detect_postorius(
-            session, url, soup, options
+        # Most probed pages aren't Mailman at all, so rule them out before parsing.
+        if not any(
+            footer_string.encode() in response.content
+            for footer_string in HyperkittyExtractor._footer_anchor_strings
         ):
-            return extractor
+            return None
+
+        soup = Soup(response.content)
+
+        if not (footer := soup.try_find("footer")):
+            return None
+
+        # One scan of the footer tells both frontends apart.
+        footer_strings = {
+            str(footer_anchor.tag.string)
+            for footer_anchor in footer.find_all(
+                "a", string=HyperkittyExtractor._footer_anchor_strings
+            )
+        }
 
-        if extractor := HyperkittyExtractor.detect_hyperkitty(
-            session, url, soup, options
+        # A Postorius page without its nav links may still be detected as HyperKitty.
+        if "Postorius Documentation" in footer_strings and (
+            extractor := HyperkittyExtractor.detect_postorius(
+                session, url, soup, options
+            )
         ):
             return extractor
 
+        if "HyperKitty" in footer_strings:
+            return HyperkittyExtractor.detect_hyperkitty(session, url, soup, options)
+
     @staticmethod
     def detect_postorius(
         session: Session, url: str, soup: Soup, options: ExtractorOptions
     ):
-        if not (footer := soup.try_find("footer")):
-            return None
-
-        if not footer.try_find("a", string="Postorius Documentation"):
-            return False
-
         if not (nav_link_anchors := soup.find_all("a", class_="nav-link")):
             return None
 
@@ -109,18 +130,38 @@ class HyperkittyExtractor(Extractor):
     def detect_hyperkitty(
         session: Session, url: str, soup: Soup, options: ExtractorOptions
     ):
-        if not (footer := soup.try_find("footer")):
-            return None
-
-        if not footer.try_find("a", string="HyperKitty"):
-            return False
-
         if not (navbar_brand_anchor := soup.try_find("a", class_="navbar-brand")):
             return None
 
         base_url = normalize_url(urljoin(url, navbar_brand_anchor.get("href")))
         return HyperkittyExtractor(session, base_url, options)
 
+    @staticmethod
+    def _parse_time(time: str):
+        # ISO 8601 times don't need dateparser's heuristics. Only try them when the time
+        # starts like one, so that localized times don't pay for a failed parse.
+        if time[:4].isdigit() and time[4:5] == "-":
+            try:
+                return datetime.fromisoformat(time)
+            except ValueError:
+                pass
+
+        return dateparser.parse(time)
+
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+
+        # URL lookups and lazy board fetches often land on the same few pages.
+        self._get_soup = lru_cache(maxsize=16)(self._do_get_soup)
+        self._last_pages: dict[tuple[str, ...], int] = {}
+
+    def _do_get_soup(self, url: str):
+        response = self._session.get(url, should_cache=True)
+        return response, Soup(response.content)
+
+    def _get_list_url(self, list_id: str):
+        return normalize_url(urljoin(self.base_url, f"list/{list_id}"))
+
     def _fetch_top_boards(self):
         pass
 
@@ -128,20 +169,19 @@ class HyperkittyExtractor(Extractor):
         pass
 
     def _get_node_from_url(self, url: str):
-        response = self._session.get(url, should_cache=True)
+        response, soup = self._get_soup(url)
         resolved_url = normalize_url(response.url)
 
         if resolved_url == self.base_url:
             return self.root
 
         parsed_url = urlparse(resolved_url)
-        path = PurePosixPath(parsed_url.path)
+        path_parts = parsed_url.path.strip("/").split("/")
 
-        if len(path.parts) >= 4 and path.parts[-2] == "thread":
-            board_id = path.parts[-3]
-            thread_id = path.parts[-1]
+        if len(path_parts) >= 3 and path_parts[-2] == "thread":
+            board_id = path_parts[-3]
+            thread_id = path_parts[-1]
 
-            soup = Soup(response.content)
             thread_header_div = soup.find("div", class_="thread-header")
             thread_h3 = thread_header_div.find("h3")
 
@@ -152,15 +192,17 @@ class HyperkittyExtractor(Extractor):
                 data={},
                 title=thread_h3.string,
             )
-        elif len(path.parts) >= 2 and path.parts[-2] == "list":
-            return self.find_board((path.parts[-1],))
+        elif len(path_parts) >= 2 and path_parts[-2] == "list":
+            return self.find_board((path_parts[-1],))
 
         raise ValueError
 
     def _fetch_lazy_subboard(self, board: Board, subboard_id: str):
-        url = normalize_url(urljoin(self.base_url, f"list/{subboard_id}"))
-        response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+        if subboard := self._subboards[board.path].get(subboard_id):
+            return subboard
+
+        url = self._get_list_url(subboard_id)
+        response, soup = self._get_soup(url)
 
         title = ""
 
@@ -184,24 +226,35 @@ class HyperkittyExtractor(Extractor):
         url: str = self.base_url
 
         while href != "#":
-            response = self._session.get(url, should_cache=True)
-            soup = Soup(response.content)
-            list_anchors = soup.find_all("a", class_="list-name")
-
-            for list_anchor in list_anchors:
-                list_id = PurePosixPath(urlparse(list_anchor.get("href")).path).parts[
-                    -1
-                ]
-                yield self._fetch_lazy_subboard(board, list_id)
-
-            page_link_anchors = soup.find_all("a", class_="page-link")
+            _, soup = self._get_soup(url)
+            list_anchors = soup.select(self._list_name_selector)
+            list_ids = [
+                urlparse(list_anchor.get("href")).path.rstrip("/").rsplit("/", 1)[-1]
+                for list_anchor in list_anchors
+            ]
+
+            page_link_anchors = soup.select(self._page_link_anchor_selector)
             next_page_anchor = page_link_anchors[-1]
 
             href = next_page_anchor.get("href")
             url = urljoin(self.base_url, href)
 
+            # Fetch the lists we don't know yet and the next index page while the
+            # boards of this one are being built.
+            self._session.prefetch(
+                self._get_list_url(list_id)
+                for list_id in list_ids
+                if list_id not in self._subboards[board.path]
+            )
+
+            if href != "#":
+                self._session.prefetch((url,))
+
+            for list_id in list_ids:
+                yield self._fetch_lazy_subboard(board, list_id)
+
     def _fetch_board_page_threads(self, board: Board, state: PageState):
-        match = re.match(r"^.*latest\?page=(\d+)$", state.url)
+        match = self._latest_page_regex.search(state.url)
 
         if match:
             cur_page = int(match.group(1))
@@ -225,29 +278,59 @@ class HyperkittyExtractor(Extractor):
             thread_spans = soup.find_all("span", class_="thread-title")
             thread_anchors = [thread_span.find("a") for thread_span in thread_spans]
 
-        for thread_anchor in thread_anchors:
+        # The page count is read from the first page of a crawl and reused for the
+        # rest of the board.
+        if cur_page == 1 or board.path not in self._last_pages:
+            if page_link_tags := soup.select(self._page_link_selector):
+                self._last_pages[board.path] = int(page_link_tags[-2].string)
+            else:
+                self._last_pages[board.path] = cur_page
+
+        next_state = None
+
+        if cur_page < self._last_pages[board.path]:
+            next_state = PageState(
+                url=urljoin(state.url, f"latest?page={cur_page + 1}"),
+                page=state.page + 1,
+            )
+            # Fetch the next page while the threads of this one are consumed.
+            self._session.prefetch((next_state.url,))
+
+        thread_urls = [
+            urljoin(state.url, thread_anchor.get("href"))
+            for thread_anchor in thread_anchors
+        ]
+
+        for i, (thread_anchor, thread_url) in enumerate(
+            zip(thread_anchors, thread_urls)
+        ):
+            # The posts of every thread are usually fetched right after it's yielded,
+            # so keep the first pages of the next few threads in flight.
+            self._session.prefetch(
+                thread_urls[i : i + self._session.concurrent_requests]
+            )
+
             yield Thread(
                 path=board.path + (thread_anchor.get("name"),),
-                url=urljoin(state.url, thread_anchor.get("href")),
+                url=thread_url,
                 origin=origin,
                 data={},
                 title=str(thread_anchor.tag.contents[-1]).strip(),
             )
 
-        if page_link_tags := soup.find_all(class_="page-link"):
-            last_page = int(page_link_tags[-2].string)
-
-            if cur_page < last_page:
-                return PageState(
-                    url=urljoin(state.url, f"latest?page={cur_page + 1}"),
-                    page=state.page + 1,
-                )
+        return next_state
 
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
         origin = state.url
-        response = self._session.get(origin)
 
         if state.url == thread.url:
+            response = self._session.get(origin)
+            next_state = PageState(
+                url=urljoin(state.url, "replies?sort=thread"), page=state.page + 1
+            )
+            # Fetch the first batch of replies while the thread page is parsed.
+            self._session.prefetch((next_state.url,))
+
             soup = Soup(response.content)
 
             email_author_div = soup.find("div", class_="email-author")
@@ -267,27 +350,39 @@ class HyperkittyExtractor(Extractor):
                 origin=origin,
                 data={},
                 author=str(email_author_div.find("a").string),
-                creation_time=dateparser.parse(time),
+                creation_time=self._parse_time(time),
                 content="".join(str(v) for v in email_body_div.contents),
             )
 
-            return PageState(
-                url=urljoin(state.url, "replies?sort=thread"), page=state.page + 1
-            )
+            return next_state
 
-        json = response.json()
+        json = self._session.get_json(origin)
+        next_state = None
+
+        if json["more_pending"]:
+            next_offset = json["next_offset"]
+            next_state = PageState(
+                url=urljoin(state.url, f"replies?sort=thread&offset={next_offset}"),
+                page=state.page + 1,
+            )
+            # The next offset is only known from this response, so keep one batch
+            # in flight while this one is parsed.
+            self._session.prefetch((next_state.url,))
 
         replies_html = json["replies_html"]
         soup = Soup(replies_html)
 
-        reply_level_divs = soup.find_all("div", class_=["even", "odd"])
-        prev_reply_level = 0
+        reply_level_divs = soup.select(self._reply_selector)
+        # The last reply seen at each level. Levels start at 0 for direct replies to the
+        # thread's first email, so a reply's ancestors are the entries before its own
+        # level.
         subpath: list[str] = []
 
         for reply_level_div in reply_level_divs:
             for klass in reply_level_div.get_list("class"):
-                if match := self._reply_level_regex.match(klass):
-                    cur_reply_level = int(match.group(1))
+                # Cheaper than a regex match on every class of every reply.
+                if klass.startswith("reply-level-"):
+                    cur_reply_level = int(klass.removeprefix("reply-level-"))
                     break
             else:
                 cur_reply_level = 0
@@ -295,37 +390,27 @@ class HyperkittyExtractor(Extractor):
             email_header_div = reply_level_div.find("div", class_="email-header")
             post_id = email_header_div.get("id")
 
-            if cur_reply_level > prev_reply_level:
-                subpath.append(post_id)
-            else:
-                subpath[-(prev_reply_level - cur_reply_level - 1) :] = [post_id]
+            del subpath[cur_reply_level:]
+            subpath.append(post_id)
 
             email_author_div = reply_level_div.find("div", class_="email-author")
 
-            email_time_div = soup.find("div", class_="time")
+            email_time_div = reply_level_div.find("div", class_="time")
             email_time_span = email_time_div.find("span")
             time = email_time_span.get("title").removeprefix("Sender's time: ")
 
+            messagelink_div = reply_level_div.find("div", class_="messagelink")
             email_body_div = reply_level_div.find("div", class_="email-body")
 
             yield Post(
                 path=thread.path,
                 subpath=tuple(subpath),
-                url=urljoin(
-                    origin, soup.find("div", class_="messagelink").find("a").get("href")
-                ),
+                url=urljoin(origin, messagelink_div.find("a").get("href")),
                 origin=origin,
                 data={},
                 author=str(email_author_div.find("a").string),
-                creation_time=dateparser.parse(time),
+                creation_time=self._parse_time(time),
                 content="".join(str(v) for v in email_body_div.contents),
             )
 
-            prev_reply_level = cur_reply_level
-
-        if json["more_pending"]:
-            next_offset = json["next_offset"]
-            return PageState(
-                url=urljoin(state.url, f"replies?sort=thread&offset={next_offset}"),
-                page=state.page + 1,
-            )
+        return next_state
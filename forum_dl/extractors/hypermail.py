@@ -2,20 +2,24 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 
-from pathlib import PurePosixPath
 from urllib.parse import urljoin, urlparse, urlunparse
 from itertools import islice
+from functools import lru_cache
 import bs4
 import re
 
-from .common import normalize_url, regex_match
+from .common import normalize_url, get_declared_encoding
 from .common import Extractor, ExtractorOptions, Board, Thread, Post, PageState
 from ..session import Session
-from ..soup import Soup
+from ..soup import Soup, tag_strainer, class_strainer
+
+if TYPE_CHECKING:
+    from requests import Response
 
 
 class HypermailPageState(PageState):
     relative_urls: list[str]
+    relative_url_index: int
 
 
 class HypermailExtractor(Extractor):
@@ -34,47 +38,69 @@ class HypermailExtractor(Extractor):
         },
     ]
 
-    _page_href_regex = re.compile(r"^(\d+)/index.html$")
-    _post_href_regex = re.compile(r"^(\d+).html$")
+    _page_href_regex = re.compile(r"^(\d+)/index\.html$")
+    _post_href_regex = re.compile(r"^(\d+)\.html$")
+    _generator_regex = re.compile(r"^hypermail")
+    _header_meta_regex = re.compile(r"^(Author|Subject|Date)$")
+    _index_title_regex = re.compile(
+        r"^.*?(by thread|by author|with attachments|by date)\s*$"
+    )
+    _detect_strainer = tag_strainer("meta", "title")
+    _messages_list_strainer = class_strainer("div", "messages-list")
 
     @staticmethod
     def _detect(session: Session, url: str, options: ExtractorOptions):
         response = session.try_get(
-            normalize_url(url, remove_suffixes=[], append_slash=False),
+            normalize_url(url, remove_suffixes=(), append_slash=False),
             should_cache=True,
             should_retry=False,
         )
-        soup = Soup(response.content)
+
+        # The generator meta below is required, so pages without it needn't be parsed.
+        if b"hypermail" not in response.content:
+            return None
+
+        soup = Soup(
+            response.content,
+            parse_only=HypermailExtractor._detect_strainer,
+            from_encoding=get_declared_encoding(response),
+        )
 
         _ = soup.find(
             "meta",
-            attrs={"name": "generator", "content": re.compile("^hypermail.*$")},
+            attrs={"name": "generator", "content": HypermailExtractor._generator_regex},
         )
 
         header_metas = soup.try_find(
-            "meta", attrs={"name": re.compile("^(Author)|(Subject)|(Date)$")}
+            "meta", attrs={"name": HypermailExtractor._header_meta_regex}
         )
         title_title = soup.try_find(
-            "title",
-            string=re.compile(
-                "^.*?(by thread)|(by author)|(with attachments)|(by date)$"
-            ),
+            "title", string=HypermailExtractor._index_title_regex
         )
 
         if header_metas or title_title:
             parsed_url = urlparse(response.url)
-            path = PurePosixPath(parsed_url.path)
+            # Drop the period directory and the index file name.
+            base_path = parsed_url.path.rstrip("/").rsplit("/", 2)[0]
             base_url = normalize_url(
-                str(
-                    urlunparse(
-                        parsed_url._replace(path=str(PurePosixPath(*path.parts[:-2])))
-                    )
-                )
+                str(urlunparse(parsed_url._replace(path=base_path)))
             )
             return HypermailExtractor(session, base_url, options)
 
         return HypermailExtractor(session, response.url, options)
 
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+
+        # Every thread of a period is read from that period's shared index page.
+        self._get_thread_index = lru_cache(maxsize=4)(self._do_get_thread_index)
+
+    def _do_get_thread_index(self, url: str):
+        response = self._session.get(url)
+        return response, Soup(
+            response.content, from_encoding=get_declared_encoding(response)
+        )
+
     def _fetch_top_boards(self):
         pass
 
@@ -89,10 +115,10 @@ class HypermailExtractor(Extractor):
             return self.root
 
         parsed_url = urlparse(resolved_url)
-        path = PurePosixPath(parsed_url.path)
+        file_name = parsed_url.path.rstrip("/").rsplit("/", 1)[-1]
 
-        if len(path.parts) >= 2 and self._post_href_regex.match(path.parts[-1]):
-            thread_id = path.parts[-1].removesuffix(".html")
+        if self._post_href_regex.match(file_name):
+            thread_id = file_name.removesuffix(".html")
             return Thread(
                 path=(thread_id,),
                 url=url,
@@ -112,24 +138,26 @@ class HypermailExtractor(Extractor):
     def _fetch_board_page_threads(self, board: Board, state: PageState):
         if state.url == board.url:
             response = self._session.get(board.url)
-            soup = Soup(response.content)
+            soup = Soup(response.content, from_encoding=get_declared_encoding(response))
 
             page_anchors = soup.find_all("a", attrs={"href": self._page_href_regex})
-            relative_urls = list(
-                reversed([page_anchor.get("href") for page_anchor in page_anchors])
-            )
+            relative_urls = [page_anchor.get("href") for page_anchor in page_anchors]
 
-            relative_url = relative_urls.pop()
             return HypermailPageState(
-                url=urljoin(self.base_url, relative_url),
+                url=urljoin(self.base_url, relative_urls[0]),
                 relative_urls=relative_urls,
+                relative_url_index=1,
                 page=state.page + 1,
             )
 
         state = cast(HypermailPageState, state)
 
         response = self._session.get(state.url)
-        soup = Soup(response.content)
+        soup = Soup(
+            response.content,
+            parse_only=self._messages_list_strainer,
+            from_encoding=get_declared_encoding(response),
+        )
 
         messages_list_div = cast(
             bs4.element.Tag, soup.find("div", class_="messages-list")
@@ -137,6 +165,10 @@ class HypermailExtractor(Extractor):
         root_ul = cast(bs4.element.Tag, messages_list_div.find("ul"))
         child_uls = root_ul.find_all("ul")
 
+        # Post hrefs are bare file names, so they can be appended to the base directory
+        # instead of being resolved by urljoin one by one.
+        base_dir_url = urljoin(self.base_url, ".")
+
         for child_ul in child_uls:
             if not (
                 thread_anchor := child_ul.try_find(
@@ -145,36 +177,50 @@ class HypermailExtractor(Extractor):
             ):
                 continue
 
-            href = thread_anchor.get("href")
-            thread_id = regex_match(self._post_href_regex, href).group(1)
+            href = cast(str, thread_anchor.get("href"))
+            # Already matched by the find above.
+            thread_id = href.removesuffix(".html")
             yield Thread(
                 path=(thread_id,),
-                url=urljoin(self.base_url, href),
+                url=base_dir_url + href,
                 origin=response.url,
                 data={},
                 title="",  # TODO.
             )
 
-        if state.relative_urls:
-            relative_url = state.relative_urls.pop()
+        if state.relative_url_index < len(state.relative_urls):
+            relative_url = state.relative_urls[state.relative_url_index]
             return HypermailPageState(
                 url=urljoin(self.base_url, relative_url),
                 page=state.page + 1,
                 relative_urls=state.relative_urls,
+                relative_url_index=state.relative_url_index + 1,
             )
 
+    @staticmethod
+    def _get_depth(tag: bs4.element.Tag):
+        depth = 0
+        parent = tag.parent
+
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+
+        return depth
+
     def _fetch_thread_page_posts(self, thread: Thread, state: PageState):
         if state.url == thread.url:
             state.url = urljoin(thread.url, ".")
 
-        response = self._session.get(state.url)
-        soup = Soup(response.content)
+        _, soup = self._get_thread_index(state.url)
 
-        root_anchor = soup.find("a", attrs={"href": f"{thread.path[-1]}.html"})
-        root_pos = len(list(root_anchor.parents))
+        root_href = f"{thread.path[-1]}.html"
+        root_anchor = soup.find("a", href=root_href)
+        root_pos = self._get_depth(root_anchor.tag)
 
-        href = root_anchor.get("href")
-        yield self._fetch_post(state, thread.path, (), urljoin(thread.url, href))
+        post_urls = [urljoin(thread.url, root_href)]
+        state_dir_url = urljoin(state.url, ".")
+        post_subpaths: list[tuple[str, ...]] = [()]
 
         child_ul = root_anchor.find_next("ul")
         child_anchors = child_ul.find_all("a", attrs={"href": self._post_href_regex})
@@ -183,32 +229,37 @@ class HypermailExtractor(Extractor):
         subpath: list[str] = []
 
         for child_anchor in child_anchors:
-            child_pos = len(list(child_anchor.parents))
+            child_pos = self._get_depth(child_anchor.tag)
             cur_depth = (child_pos - root_pos) // 2
 
             href = child_anchor.get("href")
-            post_id = regex_match(self._post_href_regex, href).group(1)
+            post_id = href.removesuffix(".html")
 
             if cur_depth > prev_depth:
                 subpath.append(post_id)
             else:
                 subpath[-(prev_depth - cur_depth - 1) :] = [post_id]
 
-            yield self._fetch_post(
-                state, thread.path, tuple(subpath), urljoin(state.url, href)
-            )
+            post_urls.append(state_dir_url + href)
+            post_subpaths.append(tuple(subpath))
 
             prev_depth = cur_depth
 
-    def _fetch_post(
+        # Posts are one page each, so keep several of them in flight.
+        responses = self._session.get_many(post_urls)
+
+        for url, post_subpath, response in zip(post_urls, post_subpaths, responses):
+            yield self._extract_post(state, thread.path, post_subpath, url, response)
+
+    def _extract_post(
         self,
         state: PageState,
         path: tuple[str, ...],
         subpath: tuple[str, ...],
         url: str,
+        response: Response,
     ):
-        response = self._session.get(url)
-        soup = Soup(response.content)
+        soup = Soup(response.content, from_encoding=get_declared_encoding(response))
 
         author_meta = soup.find("meta", attrs={"name": "Author"})
 
@@ -225,5 +276,5 @@ class HypermailExtractor(Extractor):
             data={},
             author=author_meta.get("content"),
             creation_time=date_meta.get("content"),
-            content="".join(str(v) for v in islice(address.next_siblings, 1, None)),
+            content="".join(map(str, islice(address.next_siblings, 1, None))),
         )
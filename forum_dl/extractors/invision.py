@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import *  # type: ignore
 
 import re
+import soupsieve
 
 from .common import (
     HtmlExtractor,
@@ -12,9 +13,10 @@ from .common import (
     Post,
     PageState,
     regex_match,
+    get_declared_encoding,
 )
 from ..session import Session
-from ..soup import Soup, SoupTag
+from ..soup import Soup, SoupTag, class_strainer
 
 if TYPE_CHECKING:
     from requests import Response
@@ -76,11 +78,30 @@ class InvisionExtractor(HtmlExtractor):
     _board_next_page_css = 'link[rel="next"]'
     _thread_item_css = "article.ipsComment"
     _thread_next_page_css = 'link[rel="next"]'
+    _category_strainer = class_strainer("li", "cForumRow")
+    _subboard_strainer = class_strainer("div", "cForumGrid")
+    _category_and_board_selector = soupsieve.compile(
+        "li.cForumRow, li.cForumRow div.cForumGrid"
+    )
+    _board_anchor_selector = soupsieve.compile("h3.cForumGrid__title a")
+    _thread_anchor_selector = soupsieve.compile("h4.ipsDataItem_title a[title]")
+    _content_selector = soupsieve.compile('div[data-role="commentContent"]')
+    _author_pane_selector = soupsieve.compile("div.cAuthorPane_content")
+    _author_anchor_selector = soupsieve.compile("h3.cAuthorPane_author a")
+    _comment_id_regex = re.compile(r"^elComment_(\d+)")
 
     @staticmethod
     def _detect(session: Session, url: str, options: ExtractorOptions):
         response = session.try_get(url, should_cache=True, should_retry=False)
-        soup = Soup(response.content)
+
+        # Rule out other software before parsing the whole page.
+        if (
+            b"breadcrumbList" not in response.content
+            or b"Invision Community" not in response.content
+        ):
+            return None
+
+        soup = Soup(response.content, from_encoding=get_declared_encoding(response))
 
         breadcrumbs_ul = soup.find("ul", attrs={"data-role": "breadcrumbList"})
         breadcrumb_lis = breadcrumbs_ul.find_all("li")
@@ -90,33 +111,46 @@ class InvisionExtractor(HtmlExtractor):
             base_url = breadcrumb_lis[1].find("a").get("href")
 
         if soup.find("a", attrs={"title": "Invision Community"}):
-            return InvisionExtractor(session, base_url, options)
+            extractor = InvisionExtractor(session, base_url, options)
+            # The detected URL is usually resolved next, so don't parse it twice.
+            extractor._detected_soups[url] = soup
+            return extractor
+
+    def __init__(self, session: Session, base_url: str, options: ExtractorOptions):
+        super().__init__(session, base_url, options)
+
+        self._detected_soups: dict[str, Soup] = {}
 
     def _fetch_top_boards(self):
         self._are_subboards_fetched[self.root.path] = True
 
         response = self._session.get(self.base_url, should_cache=True)
-        soup = Soup(response.content)
+        soup = Soup(
+            response.content,
+            parse_only=self._category_strainer,
+            from_encoding=get_declared_encoding(response),
+        )
 
-        category_lis = soup.find_all("li", class_="cForumRow")
-        for category_li in category_lis:
-            category_id = category_li.get("data-categoryid")
-            category_anchor = category_li.find("h2").find_all("a")[1]
+        category_id = ""
+        category_anchor = None
 
-            self._set_board(
-                path=(category_id,),
-                url=category_anchor.get("href"),
-                origin=response.url,
-                data={},
-                title=category_anchor.string,
-                are_subboards_fetched=True,
-            )
+        # Categories and their boards in document order, in a single walk of the tree.
+        for tag in soup.select(self._category_and_board_selector):
+            if tag.tag.name == "li":
+                category_id = tag.get("data-categoryid")
+                category_anchor = tag.find("h2").find_all("a", limit=2)[1]
 
-            board_divs = category_li.find_all("div", class_="cForumGrid")
-            for board_div in board_divs:
-                board_id = board_div.get("data-forumid")
-                board_h3 = board_div.find("h3", class_="cForumGrid__title")
-                board_anchor = board_h3.find("a")
+                self._set_board(
+                    path=(category_id,),
+                    url=category_anchor.get("href"),
+                    origin=response.url,
+                    data={},
+                    title=category_anchor.string,
+                    are_subboards_fetched=True,
+                )
+            elif category_anchor:
+                board_id = tag.get("data-forumid")
+                board_anchor = tag.select_one(self._board_anchor_selector)
 
                 self._set_board(
                     path=(category_id, board_id),
@@ -127,6 +161,8 @@ class InvisionExtractor(HtmlExtractor):
                     are_subboards_fetched=True,
                 )
 
+        # Every board page is visited for its subboards, so request them all at once.
+        self._session.prefetch(board.url for board in self._boards[1:])
         self._fetch_lower_boards(self.root)
 
     def _do_fetch_subboards(self, board: Board):
@@ -134,15 +170,21 @@ class InvisionExtractor(HtmlExtractor):
             return
 
         response = self._session.get(board.url, should_cache=True)
-        soup = Soup(response.content)
+        soup = Soup(
+            response.content,
+            parse_only=self._subboard_strainer,
+            from_encoding=get_declared_encoding(response),
+        )
 
         subboard_divs = soup.find_all("div", class_="cForumGrid")
+        subboard_urls: list[str] = []
+
         for subboard_div in subboard_divs:
             subboard_id = subboard_div.get("data-forumid")
             subboard_h3 = subboard_div.find("h3")
             subboard_anchor = subboard_h3.find("a")
 
-            self._set_board(
+            subboard = self._set_board(
                 path=board.path + (subboard_id,),
                 url=subboard_anchor.get("href"),
                 origin=response.url,
@@ -150,10 +192,16 @@ class InvisionExtractor(HtmlExtractor):
                 title=subboard_anchor.string,
                 are_subboards_fetched=True,
             )
+            subboard_urls.append(subboard.url)
+
+        # The subboards are visited next by _fetch_lower_boards.
+        self._session.prefetch(subboard_urls)
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        soup = Soup(response.content)
+
+        if not (soup := self._detected_soups.pop(url, None)):
+            soup = Soup(response.content, from_encoding=get_declared_encoding(response))
 
         breadcrumbs_ul = soup.find("ul", attrs={"data-role": "breadcrumbList"})
         breadcrumb_lis = breadcrumbs_ul.find_all("li")
@@ -167,20 +215,18 @@ class InvisionExtractor(HtmlExtractor):
             thread_id = soup.find("body").get("data-pageid")
             title_meta = soup.find("meta", attrs={"property": "og:title"})
 
-            for cur_board in self._boards:
-                if cur_board.url == board_href:
-                    return Thread(
-                        path=cur_board.path + (thread_id,),
-                        url=url,
-                        origin=response.url,
-                        data={},
-                        title=str(title_meta.get("content")),
-                    )
+            if cur_board := self._boards_by_url.get(board_href):
+                return Thread(
+                    path=cur_board.path + (thread_id,),
+                    url=url,
+                    origin=response.url,
+                    data={},
+                    title=str(title_meta.get("content")),
+                )
         # Board.
         else:
-            for cur_board in self._boards:
-                if cur_board.url == url:
-                    return cur_board
+            if cur_board := self._boards_by_url.get(url):
+                return cur_board
 
         raise ValueError
 
@@ -194,8 +240,7 @@ class InvisionExtractor(HtmlExtractor):
         self, board: Board, state: PageState, response: Response, tag: SoupTag
     ):
         thread_id = tag.get("data-rowid")
-        title_h4 = tag.find("h4", class_="ipsDataItem_title")
-        thread_anchor = title_h4.find("a", attrs={"title": True})
+        thread_anchor = tag.select_one(self._thread_anchor_selector)
 
         return Thread(
             path=board.path + (thread_id,),
@@ -208,13 +253,13 @@ class InvisionExtractor(HtmlExtractor):
     def _extract_thread_page_post(
         self, thread: Thread, state: PageState, response: Response, tag: SoupTag
     ):
-        content_div = tag.find("div", attrs={"data-role": "commentContent"})
-        author_div = tag.find("div", class_="cAuthorPane_content")
+        content_div = tag.select_one(self._content_selector)
+        author_div = tag.select_one(self._author_pane_selector)
         time_tag = author_div.find("time")
 
-        author_h3 = author_div.find("h3", class_="cAuthorPane_author")
+        author_anchor = author_div.select_one(self._author_anchor_selector)
         url_div = author_div.find("div")
-        post_id = regex_match(re.compile(r"^elComment_(\d+)"), tag.get("id")).group(1)
+        post_id = regex_match(self._comment_id_regex, tag.get("id")).group(1)
 
         return Post(
             path=thread.path,
@@ -222,7 +267,7 @@ class InvisionExtractor(HtmlExtractor):
             url=url_div.find("a").get("href"),
             origin=response.url,
             data={},
-            author=author_h3.find("a").string,
+            author=author_anchor.string,
             creation_time=time_tag.get("datetime"),
             content="".join(str(v) for v in content_div.contents),
         )
@@ -209,7 +209,7 @@ class PhpbbExtractor(HtmlExtractor):
         # Check for the existence of "viewforum.php".
         response = session.try_get(
             urljoin(
-                normalize_url(url, remove_suffixes=["viewforum.php", "viewtopic.php"]),
+                normalize_url(url, remove_suffixes=("viewforum.php", "viewtopic.php")),
                 "viewforum.php",
             ),
             should_cache=True,
@@ -223,7 +223,7 @@ class PhpbbExtractor(HtmlExtractor):
         return PhpbbExtractor(
             session,
             normalize_url(
-                response.url, remove_suffixes=["viewforum.php", "viewtopic.php"]
+                response.url, remove_suffixes=("viewforum.php", "viewtopic.php")
             ),
             options,
         )
@@ -373,12 +373,12 @@ class PhpbbExtractor(HtmlExtractor):
 
     def _resolve_url(self, url: str):
         return normalize_url(
-            self._session.get(url, should_cache=True).url, keep_queries=["f", "t"]
+            self._session.get(url, should_cache=True).url, keep_queries=("f", "t")
         )
 
     def _get_node_from_url(self, url: str):
         response = self._session.get(url, should_cache=True)
-        resolved_url = normalize_url(response.url, keep_queries=["f", "t"])
+        resolved_url = normalize_url(response.url, keep_queries=("f", "t"))
 
         parsed_url = urlparse(resolved_url)
         parts = PurePosixPath(parsed_url.path).parts
@@ -337,7 +337,7 @@ class SimplemachinesExtractor(HtmlExtractor):
         return normalize_url(
             self._session.get(url, should_cache=True).url,
             append_slash=True,
-            keep_queries=["board", "topic"],
+            keep_queries=("board", "topic"),
         )
 
     def _get_node_from_url(self, url: str):
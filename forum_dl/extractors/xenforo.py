@@ -275,7 +275,7 @@ class XenforoExtractor(HtmlExtractor):
     @staticmethod
     def _detect(session: Session, url: str, options: ExtractorOptions):
         response = session.try_get(
-            normalize_url(url, remove_suffixes=[], append_slash=False),
+            normalize_url(url, remove_suffixes=(), append_slash=False),
             should_cache=True,
             should_retry=False,
         )
@@ -68,6 +68,13 @@ def build_parser():
         default="2",
         help="A constant by which sleep time is multiplied on each retry (default: 2)",
     )
+    session.add_argument(
+        "--concurrent-requests",
+        metavar="N",
+        dest="concurrent_requests",
+        default="1",
+        help="Maximum number of HTTP requests made in parallel, prefetching pages likely to be read next; 1 disables prefetching, which is always off with --get-urls or --warc-output (default: 1)",
+    )
     session.add_argument(
         "--user-agent",
         metavar="UA",
@@ -4,6 +4,7 @@ from typing import *  # type: ignore
 
 from pydantic import BaseModel
 from functools import lru_cache, wraps
+from concurrent.futures import Future, ThreadPoolExecutor
 from tenacity import (
     retry,
     wait_random_exponential,
@@ -13,6 +14,11 @@ from tenacity import (
 import time
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .exceptions import AlreadyVisitedError, AlreadyFailedError
 from .version import __version__
 
@@ -28,9 +34,12 @@ class SessionOptions(BaseModel):
     warc_output: str
     user_agent: str
     get_urls: bool
+    concurrent_requests: int
 
 
 class Session:
+    max_prefetched = 256
+
     def __init__(self, options: SessionOptions):
         self._warc_file = None
 
@@ -44,27 +53,63 @@ class Session:
 
         # For the `warcio` recording to work, `requests` must be imported only after `capture_http`.
         import requests
+        from requests.adapters import HTTPAdapter
 
         self._session = requests.Session()
+
+        # Let every prefetching thread keep its own connection alive to a given host.
+        adapter = HTTPAdapter(pool_maxsize=max(options.concurrent_requests, 1))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Session-level, so that it's merged into requests that set their own headers.
+        self._session.headers["User-Agent"] = options.user_agent
         self._options = options
         self._cache: dict[
             tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]],
             requests.Response,
         ] = {}
+        self._json_cache: dict[
+            tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]], Any
+        ] = {}
         self._past_requests: set[
             tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]]
         ] = set()
         self._past_failed_requests: set[
             tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]]
         ] = set()
+        self._prefetched: dict[
+            tuple[str, frozenset[tuple[str, Any]], frozenset[tuple[str, Any]]],
+            Future[requests.Response],
+        ] = {}
+
+        # `capture_http` patches `http.client` globally, so WARC recording can't be done
+        # from several threads at once. With --get-urls, URLs are printed as they are
+        # requested, so prefetching would print them out of order and print pages that
+        # are never read.
+        self._executor = None
+
+        if (
+            options.concurrent_requests > 1
+            and not self._warc_file
+            and not options.get_urls
+        ):
+            self._executor = ThreadPoolExecutor(max_workers=options.concurrent_requests)
 
         self.delay = 1
         self.attempts = 0
 
     def __del__(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
         if self._warc_file:
             self._warc_file.close()
 
+    @property
+    def concurrent_requests(self):
+        return self._options.concurrent_requests
+
     def get(
         self,
         url: str,
@@ -87,6 +132,48 @@ class Session:
 
         return response
 
+    def get_json(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any] = {},
+        headers: dict[str, Any] = {},
+        should_cache: bool = False,
+        should_retry: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        key = (url, frozenset(params.items()), frozenset(headers.items()))
+        # Decode each cached response only once. Entries are dropped together with the
+        # cached response, so this never holds more than the response cache. Read it
+        # before `get`, which drops it when consuming the cached response.
+        is_decoded = key in self._json_cache
+        json = self._json_cache.get(key)
+
+        response = self.get(
+            url,
+            params=params,
+            headers=headers,
+            should_cache=should_cache,
+            should_retry=should_retry,
+            **kwargs,
+        )
+
+        if is_decoded:
+            return json
+
+        json = self.decode_json(response)
+
+        if key in self._cache:
+            self._json_cache[key] = json
+
+        return json
+
+    def decode_json(self, response: Response) -> Any:
+        if orjson:
+            return orjson.loads(response.content)
+
+        return response.json()
+
     def try_get(
         self,
         url: str,
@@ -107,6 +194,7 @@ class Session:
 
             if not should_cache:
                 del self._cache[(url, frozen_params, frozen_headers)]
+                self._json_cache.pop((url, frozen_params, frozen_headers), None)
 
             return cached_response
         elif (url, frozen_params, frozen_headers) in self._past_requests:
@@ -114,33 +202,24 @@ class Session:
         elif (url, frozen_params, frozen_headers) in self._past_failed_requests:
             raise AlreadyFailedError(url, frozen_params, frozen_headers)
 
-        if should_retry:
-
-            @retry(
-                reraise=True,
-                wait=wait_random_exponential(
-                    multiplier=self._options.retry_sleep,
-                    exp_base=self._options.retry_sleep_multiplier,
-                ),
-                stop=stop_after_attempt(self._options.retries),
-                before_sleep=before_sleep_log(logging.getLogger(), logging.WARNING),
-            )
-            def retrying_get(
-                url: str,
-                *,
-                params: dict[str, Any] = {},
-                headers: dict[str, Any] = {},
-                **kwargs: Any,
+        try:
+            if future := self._prefetched.pop(
+                (url, frozen_params, frozen_headers), None
             ):
-                return self._do_get(url, params=params, headers=headers, **kwargs)
-
-            try:
-                response = retrying_get(url, params=params, headers=headers, **kwargs)
-            except:
+                response = future.result()
+            else:
+                response = self._retrying_get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    should_retry=should_retry,
+                    **kwargs,
+                )
+        except:
+            if should_retry:
                 self._past_failed_requests.add((url, frozen_params, frozen_headers))
-                raise
-        else:
-            response = self._do_get(url, params=params, headers=headers, **kwargs)
+
+            raise
 
         if should_cache:
             self._cache[(url, frozen_params, frozen_headers)] = response
@@ -149,6 +228,110 @@ class Session:
 
         return response
 
+    def prefetch(
+        self,
+        urls: Iterable[str],
+        *,
+        params: dict[str, Any] = {},
+        headers: dict[str, Any] = {},
+        should_retry: bool = True,
+        **kwargs: Any,
+    ):
+        if not self._executor:
+            return
+
+        frozen_params = frozenset(params.items())
+        frozen_headers = frozenset(headers.items())
+
+        for url in urls:
+            key = (url, frozen_params, frozen_headers)
+
+            if (
+                key in self._cache
+                or key in self._prefetched
+                or key in self._past_requests
+                or key in self._past_failed_requests
+            ):
+                continue
+
+            self._prefetched[key] = self._executor.submit(
+                self._retrying_get,
+                url,
+                params=params,
+                headers=headers,
+                should_retry=should_retry,
+                **kwargs,
+            )
+
+            # Prefetches that are never read, e.g. when an extractor stops early, must
+            # not pile up, so drop the oldest ones.
+            while len(self._prefetched) > self.max_prefetched:
+                oldest_key = next(iter(self._prefetched))
+                self._prefetched.pop(oldest_key).cancel()
+
+    def get_many(
+        self,
+        urls: Iterable[str],
+        *,
+        params: dict[str, Any] = {},
+        headers: dict[str, Any] = {},
+        should_cache: bool = False,
+        should_retry: bool = True,
+        **kwargs: Any,
+    ):
+        urls = list(urls)
+
+        for i, url in enumerate(urls):
+            # Keep the next few requests in flight while the caller processes this one.
+            self.prefetch(
+                urls[i : i + self.concurrent_requests],
+                params=params,
+                headers=headers,
+                should_retry=should_retry,
+                **kwargs,
+            )
+
+            yield self.get(
+                url,
+                params=params,
+                headers=headers,
+                should_cache=should_cache,
+                should_retry=should_retry,
+                **kwargs,
+            )
+
+    def _retrying_get(
+        self,
+        url: str,
+        *,
+        params: dict[str, Any] = {},
+        headers: dict[str, Any] = {},
+        should_retry: bool = True,
+        **kwargs: Any,
+    ) -> Response:
+        if not should_retry:
+            return self._do_get(url, params=params, headers=headers, **kwargs)
+
+        @retry(
+            reraise=True,
+            wait=wait_random_exponential(
+                multiplier=self._options.retry_sleep,
+                exp_base=self._options.retry_sleep_multiplier,
+            ),
+            stop=stop_after_attempt(self._options.retries),
+            before_sleep=before_sleep_log(logging.getLogger(), logging.WARNING),
+        )
+        def retrying_get(
+            url: str,
+            *,
+            params: dict[str, Any] = {},
+            headers: dict[str, Any] = {},
+            **kwargs: Any,
+        ):
+            return self._do_get(url, params=params, headers=headers, **kwargs)
+
+        return retrying_get(url, params=params, headers=headers, **kwargs)
+
     def _after_retry(self):
         logging.warning(f"Waiting {self.delay} seconds.")
 
@@ -165,9 +348,6 @@ class Session:
         else:
             logging.info(f"GET {url} {params} {headers}")
 
-        if not headers:
-            headers = {"User-Agent": self._options.user_agent}
-
         if self._warc_file:
             with self._capture_http(self._warc_writer):
                 return self._session.get(
@@ -2,16 +2,36 @@
 from __future__ import annotations
 from typing import *  # type: ignore
 from re import Pattern
+import re
 
 from .exceptions import TagSearchError, AttributeSearchError, PropertyError
+from bs4 import SoupStrainer  # type: ignore
 import bs4
+import soupsieve
 
 SoupInput = Callable[[Any], bool] | Pattern[str] | set[str] | str | bool | None
+SoupSelector = soupsieve.SoupSieve | str
+
+
+def tag_strainer(*names: str):
+    return SoupStrainer(list(names))
+
+
+def class_strainer(name: str, class_: str):
+    # Strainers match while parsing, before the class attribute is split into a list.
+    return SoupStrainer(name, class_=re.compile(rf"(^|\s){re.escape(class_)}(\s|$)"))
 
 
 class Soup:
-    def __init__(self, markup: str | bytes):
-        self.soup = bs4.BeautifulSoup(markup, "lxml")
+    def __init__(
+        self,
+        markup: str | bytes,
+        parse_only: SoupStrainer | None = None,
+        from_encoding: str | None = None,
+    ):
+        self.soup = bs4.BeautifulSoup(
+            markup, "lxml", parse_only=parse_only, from_encoding=from_encoding
+        )
 
     def try_find(
         self,
@@ -57,6 +77,12 @@ class Soup:
 
         return [SoupTag(tag) for tag in result]
 
+    def select(self, selector: SoupSelector, limit: int = 0) -> list[SoupTag]:
+        if isinstance(selector, str):
+            selector = soupsieve.compile(selector)
+
+        return [SoupTag(tag) for tag in selector.select(self.soup, limit)]
+
 
 class SoupTag:
     def __init__(self, tag: bs4.element.Tag):
@@ -106,6 +132,27 @@ class SoupTag:
 
         return [SoupTag(tag) for tag in result]
 
+    def select(self, selector: SoupSelector, limit: int = 0) -> list[SoupTag]:
+        if isinstance(selector, str):
+            selector = soupsieve.compile(selector)
+
+        return [SoupTag(tag) for tag in selector.select(self.tag, limit)]
+
+    def try_select_one(self, selector: SoupSelector) -> SoupTag | None:
+        if isinstance(selector, str):
+            selector = soupsieve.compile(selector)
+
+        if result := selector.select_one(self.tag):
+            return SoupTag(result)
+
+    def select_one(self, selector: SoupSelector):
+        result = self.try_select_one(selector)
+
+        if not result:
+            raise TagSearchError(self.tag, selector)
+
+        return result
+
     def find_next(
         self,
         name: SoupInput | None = None,
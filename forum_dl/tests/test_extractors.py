@@ -8,6 +8,7 @@ from ..session import Session, SessionOptions
 from ..version import __version__
 
 import itertools
+import json
 
 import hashlib
 import pytest
@@ -29,6 +30,7 @@ def test_extractors(cls: Type[Extractor], test: dict[str, Any]):
             warc_output="",
             user_agent=f"Forum-dl {__version__}",
             get_urls=False,
+            concurrent_requests=4,
         )
     )
 
@@ -136,3 +138,126 @@ def test_extractors(cls: Type[Extractor], test: dict[str, Any]):
         assert len(items) >= test_min_item_count
 
     assert not test
+
+
+def test_hyperkitty_reply_subpaths():
+    # Canned pages, so that the shape of the reply tree is checked without a live
+    # archive. HyperKitty numbers reply levels from 0 for direct replies.
+    from ..extractors.hyperkitty import HyperkittyExtractor
+
+    def email(id: str):
+        return (
+            f'<div class="email-author"><a>{id}</a></div>'
+            '<div class="time"><span title="Sender\'s time: 2020-01-01T10:00:00">'
+            "</span></div>"
+            f'<div class="messagelink"><a href="/message/{id}/">link</a></div>'
+            f'<div class="email-body">{id}</div>'
+        )
+
+    def reply(id: str, level: int):
+        return (
+            f'<div class="even reply-level-{level}">'
+            f'<div class="email-header" id="{id}">{email(id)}</div></div>'
+        )
+
+    thread_url = "https://example.org/archives/list/l@example.org/thread/T/"
+    replies = [("A", 0), ("B", 1), ("C", 2), ("D", 1), ("E", 0), ("F", 1)]
+    pages = {
+        thread_url: email("T"),
+        f"{thread_url}replies?sort=thread": json.dumps(
+            {
+                "replies_html": "".join(reply(id, level) for id, level in replies),
+                "more_pending": False,
+            }
+        ),
+    }
+
+    class Response:
+        def __init__(self, url: str):
+            self.url = url
+            self.text = pages[url]
+            self.content = self.text.encode()
+            self.headers: dict[str, str] = {}
+            self.encoding = None
+
+        def json(self):
+            return json.loads(self.text)
+
+        def raise_for_status(self):
+            pass
+
+    session = Session(
+        SessionOptions(
+            timeout=5,
+            retries=1,
+            retry_sleep=0,
+            retry_sleep_multiplier=0,
+            warc_output="",
+            user_agent=f"Forum-dl {__version__}",
+            get_urls=False,
+            concurrent_requests=1,
+        )
+    )
+    session._do_get = lambda url, **kwargs: Response(url)  # type: ignore
+
+    extractor = HyperkittyExtractor(
+        session, "https://example.org/archives/", ExtractorOptions(path=True)
+    )
+    thread = Thread(
+        path=("l@example.org", "T"),
+        url=thread_url,
+        origin=thread_url,
+        data={},
+        title="",
+    )
+
+    assert [post.subpath for post in extractor.posts(thread)] == [
+        (),
+        ("A",),
+        ("A", "B"),
+        ("A", "B", "C"),
+        ("A", "D"),
+        ("E",),
+        ("E", "F"),
+    ]
+
+
+def test_boards_by_url_after_replacing_a_duplicate_url():
+    # Lookups by URL must agree with a scan of all boards, even after a board that
+    # shares its URL with another one moves to a new URL.
+    from ..extractors.invision import InvisionExtractor
+
+    session = Session(
+        SessionOptions(
+            timeout=5,
+            retries=1,
+            retry_sleep=0,
+            retry_sleep_multiplier=0,
+            warc_output="",
+            user_agent=f"Forum-dl {__version__}",
+            get_urls=False,
+            concurrent_requests=1,
+        )
+    )
+    extractor = InvisionExtractor(
+        session, "https://example.org/forums/", ExtractorOptions(path=True)
+    )
+
+    shared_url = "https://example.org/forums/forum/1/"
+    new_url = "https://example.org/forums/forum/2/"
+
+    first_board = extractor._set_board(  # type: ignore
+        path=("1",), url=shared_url, origin=shared_url, data={}, title="First"
+    )
+    second_board = extractor._set_board(  # type: ignore
+        path=("2",), url=shared_url, origin=shared_url, data={}, title="Second"
+    )
+    assert extractor._boards_by_url[shared_url] is first_board  # type: ignore
+
+    extractor._set_board(path=("1",), url=new_url)  # type: ignore
+    assert extractor._boards_by_url[shared_url] is second_board  # type: ignore
+    assert extractor._boards_by_url[new_url] is first_board  # type: ignore
+
+    extractor._set_board(path=("2",), url=new_url)  # type: ignore
+    assert shared_url not in extractor._boards_by_url  # type: ignore
+    assert extractor._boards_by_url[new_url] is first_board  # type: ignore